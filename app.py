@@ -1,44 +1,313 @@
 # app.py
 import streamlit as st
 import pandas as pd
+import numpy as np
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from io import BytesIO
-from PIL import Image
 import os
-import zipfile
+import secrets
+import shutil
+import tempfile
+import time
 
 # ----------------------- Config -----------------------
 st.set_page_config(page_title="Smart Meter Stock Management", page_icon="📦", layout="wide")
 ROOT = Path(__file__).parent
 DATA_DIR = ROOT / "data"
 PHOTOS_DIR = ROOT / "photos"
+THUMBS_DIR = PHOTOS_DIR / "thumbs"
+DATA_FILE = DATA_DIR / "stock_ledger.parquet"
+APPEND_DIR = DATA_DIR / "stock_ledger_appends"
+PHOTOS_FILE = DATA_DIR / "photos.parquet"
+PHOTOS_APPEND_DIR = DATA_DIR / "photos_appends"
+LEGACY_CSV_FILE = DATA_DIR / "stock_ledger.csv"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
+APPEND_DIR.mkdir(parents=True, exist_ok=True)
+PHOTOS_APPEND_DIR.mkdir(parents=True, exist_ok=True)
 PHOTOS_DIR.mkdir(parents=True, exist_ok=True)
-DATA_FILE = DATA_DIR / "stock_ledger.csv"
+THUMBS_DIR.mkdir(parents=True, exist_ok=True)
+COLUMNS = [
+    "Date", "Transaction_ID", "Action", "Meter_Type", "Meter_Quantity",
+    "CIU_Quantity", "Stock_Issued_To", "Status", "Notes"
+]
+STATUSES = ["Pending Approval", "Approved", "Rejected"]
+# Status gets a fixed category set so approving/rejecting in memory never hits an unknown
+# category; Action/Meter_Type are only ever written via append_row, so inferred sets are fine
+DTYPES = {
+    "Date": "datetime64[ns]",
+    "Transaction_ID": "string",
+    "Action": "category",
+    "Meter_Type": "category",
+    # Int32 halves the bytes moved vs int64; quantities never get near 2**31
+    "Meter_Quantity": "Int32",
+    "CIU_Quantity": "Int32",
+    "Stock_Issued_To": "string",
+    "Status": pd.CategoricalDtype(STATUSES),
+    "Notes": "string",
+}
+# one row per uploaded photo, kept out of the ledger so its rows stay narrow
+PHOTO_COLUMNS = ["Transaction_ID", "Photo_Path", "Thumb_Path"]
+PHOTO_DTYPES = {c: "string" for c in PHOTO_COLUMNS}
+# the pre-parquet CSV ledger also carried the pipe-joined Photo_Path column
+LEGACY_CSV_COLUMNS = COLUMNS + ["Photo_Path"]
+LEGACY_CSV_DTYPES = {c: t for c, t in DTYPES.items() if c != "Date"}
+PARQUET_OPTS = {"engine": "pyarrow", "compression": "zstd", "index": False}
+ZIP_SPOOL_SIZE = 16 * 1024 * 1024
+COPY_BUFFER = 1 << 20
+PAGE_SIZE = 100
+TXN_OPTION_LIMIT = 500
+PHOTO_WORKERS = 8
+THUMB_SIZE = (1024, 1024)
+# fold fragments into the main file once there are this many; reading a folder of
+# thousands of one-row files is far slower than reading one file with the same rows
+MAX_FRAGMENTS = 100
 
 # ----------------------- Load / Initialize Ledger -----------------------
-if DATA_FILE.exists():
+# Each table (ledger, photos) is a main parquet file plus one small fragment per new
+# transaction in its appends folder. save_data() folds the fragments back in, and
+# append_fragment() does too once a folder holds more than MAX_FRAGMENTS.
+def path_version(p):
+    stat = p.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _read_parquet_cached(path, version, columns):
+    # main file only, keyed on its own mtime/size so a new fragment doesn't make it get
+    # parsed again. Shared object: callers must not mutate it
+    if columns is not None:
+        # pyarrow raises on columns the file doesn't have, so project only the ones it does
+        names = set(pq.read_schema(path).names)
+        columns = [c for c in columns if c in names]
+    return pd.read_parquet(path, engine="pyarrow", columns=columns)
+
+def list_fragments(append_dir):
+    # finished fragments only; in-progress writes use a dot-prefixed .tmp name
+    return sorted(append_dir.glob("*.parquet"))
+
+def read_table(main_file, append_dir, columns=None, fragments=None):
+    # fragments defaults to the current listing; compaction passes its own so it only
+    # removes what it actually read
+    for attempt in range(3):
+        parts = list_fragments(append_dir) if fragments is None else fragments
+        try:
+            frames = []
+            if main_file.exists():
+                frames.append(_read_parquet_cached(main_file, path_version(main_file), columns))
+            if parts:
+                # read the listed files whole: the schema comes from the first one, which may
+                # predate a column, and the caller's reindex sorts that out
+                frames.append(pd.read_parquet(parts, engine="pyarrow"))
+            break
+        except FileNotFoundError:
+            # another session compacted the folder between listing and reading; list again
+            if fragments is not None or attempt == 2:
+                raise
+    if not frames:
+        return None
+    return pd.concat(frames, ignore_index=True)
+
+def write_table(main_file, fragments, df_):
+    tmp = main_file.with_suffix(".parquet.tmp")
+    df_.to_parquet(tmp, **PARQUET_OPTS)
+    os.replace(tmp, main_file)
+    for p in fragments:
+        p.unlink(missing_ok=True)
+
+def compact_table(main_file, append_dir):
+    fragments = list_fragments(append_dir)
+    if fragments:
+        write_table(main_file, fragments, read_table(main_file, append_dir, fragments=fragments))
+
+def append_fragment(main_file, append_dir, name, frame):
+    append_dir.mkdir(parents=True, exist_ok=True)
+    # write under a hidden temp name and rename, so readers never see a half-written file
+    tmp = append_dir / f".{name}.parquet.tmp"
+    frame.to_parquet(tmp, **PARQUET_OPTS)
+    os.replace(tmp, append_dir / f"{name}.parquet")
+    if len(list_fragments(append_dir)) > MAX_FRAGMENTS:
+        compact_table(main_file, append_dir)
+
+def index_by_txn(df_):
+    # keep Transaction_ID as a column too; the unnamed index avoids column/level ambiguity
+    return df_.set_index("Transaction_ID", drop=False).rename_axis(None)
+
+def empty_ledger():
+    return index_by_txn(pd.DataFrame(columns=COLUMNS).astype(DTYPES))
+
+def empty_photos():
+    return index_by_txn(pd.DataFrame(columns=PHOTO_COLUMNS).astype(PHOTO_DTYPES))
+
+def ledger_version():
+    # changes whenever a main file is rewritten or a fragment is added/removed. Fragments
+    # are keyed by name: a folder's mtime/size can miss a new file on coarse-timestamp
+    # filesystems, and the size usually doesn't change at all
+    version = []
+    for main_file, append_dir in ((DATA_FILE, APPEND_DIR), (PHOTOS_FILE, PHOTOS_APPEND_DIR)):
+        if main_file.exists():
+            version += path_version(main_file)
+        version.append(tuple(p.name for p in list_fragments(append_dir)))
+    return tuple(version)
+
+@st.cache_data(show_spinner=False)
+def _load_data_cached(version):
+    # version is only the cache key — any write to the ledger invalidates it
+    ledger = read_table(DATA_FILE, APPEND_DIR, columns=COLUMNS)
+    if ledger is None:
+        return empty_ledger()
+    # reindex so ledgers written before a column was added/removed still load
+    return index_by_txn(ledger.reindex(columns=COLUMNS).astype(DTYPES))
+
+def load_data():
     try:
-        df = pd.read_csv(DATA_FILE)
+        return _load_data_cached(ledger_version())
     except Exception:
         # fallback to blank df if corrupted
-        df = pd.DataFrame(columns=[
-            "Date", "Transaction_ID", "Action", "Meter_Type", "Meter_Quantity",
-            "CIU_Quantity", "Stock_Issued_To", "Photo_Path", "Status", "Notes"
-        ])
-else:
-    df = pd.DataFrame(columns=[
-        "Date", "Transaction_ID", "Action", "Meter_Type", "Meter_Quantity",
-        "CIU_Quantity", "Stock_Issued_To", "Photo_Path", "Status", "Notes"
-    ])
+        return empty_ledger()
+
+@st.cache_data(show_spinner=False)
+def _load_photos_cached(version):
+    photos = read_table(PHOTOS_FILE, PHOTOS_APPEND_DIR, columns=PHOTO_COLUMNS)
+    if photos is None:
+        return empty_photos()
+    return index_by_txn(photos.reindex(columns=PHOTO_COLUMNS).astype(PHOTO_DTYPES))
+
+def load_photos():
+    try:
+        return _load_photos_cached(ledger_version())
+    except Exception:
+        return empty_photos()
+
+# ----------------------- Cached Reports -----------------------
+# Keyed on ledger_version() so they are rebuilt once per write, not once per rerun.
+@st.cache_data(show_spinner=False)
+def compute_summary(version):
+    ledger = _load_data_cached(version)
+    return ledger.groupby(["Meter_Type", "Status"], as_index=False, observed=True, sort=False)[
+        ["Meter_Quantity", "CIU_Quantity"]
+    ].sum()
+
+@st.cache_data(show_spinner=False)
+def sorted_ledger(version):
+    # newest first; the admin table pages through this instead of re-sorting each rerun
+    return _load_data_cached(version).sort_values(by="Date", ascending=False, kind="stable")
+
+@st.cache_data(show_spinner=False)
+def status_positions(version):
+    # row positions in sorted_ledger() per status; Status codes follow STATUSES order
+    codes = sorted_ledger(version)["Status"].cat.codes.to_numpy()
+    return {status: np.flatnonzero(codes == i) for i, status in enumerate(STATUSES)}
+
+@st.cache_data(show_spinner=False)
+def ledger_csv_bytes(version):
+    # join the photos table back in so the export still links each transaction to its photos
+    photos = _load_photos_cached(version)
+    photo_paths = photos.groupby("Transaction_ID", sort=False)["Photo_Path"].agg("|".join)
+    export = _load_data_cached(version).reset_index(drop=True)
+    export.insert(COLUMNS.index("Status"), "Photo_Path", export["Transaction_ID"].map(photo_paths).fillna(""))
+    return export.to_csv(index=False, date_format="%Y-%m-%d %H:%M:%S").encode("utf-8")
+
+@st.cache_data(show_spinner=False)
+def txn_ids(version):
+    # selectboxes get slow past a few thousand options, so offer the newest IDs only
+    ids = sorted_ledger(version)["Transaction_ID"].drop_duplicates()
+    return [""] + ids.head(TXN_OPTION_LIMIT).tolist()
+
+def clear_ledger_caches():
+    _load_data_cached.clear()
+    _load_photos_cached.clear()
+    compute_summary.clear()
+    sorted_ledger.clear()
+    status_positions.clear()
+    ledger_csv_bytes.clear()
+    txn_ids.clear()
 
 def save_data(df_):
+    # full rewrite — only needed when existing rows change (e.g. Status)
     DATA_DIR.mkdir(parents=True, exist_ok=True)
-    df_.to_csv(DATA_FILE, index=False)
+    # df_ may be stale (loaded before another session appended or compacted), so keep any
+    # row on disk it doesn't hold, and only drop the fragments that were read here
+    fragments = list_fragments(APPEND_DIR)
+    on_disk = read_table(DATA_FILE, APPEND_DIR, fragments=fragments)
+    if on_disk is not None:
+        unseen = on_disk[~on_disk["Transaction_ID"].isin(df_["Transaction_ID"])]
+        if len(unseen):
+            df_ = pd.concat([df_, unseen.reindex(columns=df_.columns)], ignore_index=True)
+    write_table(DATA_FILE, fragments, df_)
+    compact_table(PHOTOS_FILE, PHOTOS_APPEND_DIR)
+    clear_ledger_caches()
+
+def append_row(entry):
+    # write a single new transaction without rewriting the whole ledger
+    row = pd.DataFrame([entry], columns=COLUMNS).astype(DTYPES)
+    append_fragment(DATA_FILE, APPEND_DIR, entry["Transaction_ID"], row)
+    clear_ledger_caches()
+
+def append_photos(txn_id, photo_paths, thumb_paths):
+    rows = pd.DataFrame(
+        {"Transaction_ID": txn_id, "Photo_Path": photo_paths, "Thumb_Path": thumb_paths}, columns=PHOTO_COLUMNS
+    ).astype(PHOTO_DTYPES)
+    append_fragment(PHOTOS_FILE, PHOTOS_APPEND_DIR, txn_id, rows)
+    clear_ledger_caches()
+
+# one-off migration from the old CSV ledger
+if LEGACY_CSV_FILE.exists() and not DATA_FILE.exists():
+    legacy_csv = pd.read_csv(
+        LEGACY_CSV_FILE,
+        usecols=lambda c: c in LEGACY_CSV_COLUMNS,
+        dtype=LEGACY_CSV_DTYPES,
+        parse_dates=["Date"],
+        date_format="%Y-%m-%d %H:%M:%S",
+    )
+    save_data(legacy_csv)
+
+# one-off migration of the old pipe-joined Photo_Path / Photo_Thumb_Path ledger cells
+if not PHOTOS_FILE.exists():
+    legacy = read_table(DATA_FILE, APPEND_DIR)
+    photo_rows = []
+    if legacy is not None and "Photo_Path" in legacy:
+        cells = legacy.reindex(columns=["Transaction_ID", "Photo_Path", "Photo_Thumb_Path"])
+        for txn_id, photo_field, thumb_field in cells.itertuples(index=False):
+            if pd.isna(photo_field) or not photo_field:
+                continue
+            thumbs = [] if pd.isna(thumb_field) or not thumb_field else thumb_field.split("|")
+            for i, p in enumerate(photo_field.split("|")):
+                thumb = thumbs[i] if i < len(thumbs) else ""
+                photo_rows.append({"Transaction_ID": txn_id, "Photo_Path": p, "Thumb_Path": thumb})
+    pd.DataFrame(photo_rows, columns=PHOTO_COLUMNS).astype(PHOTO_DTYPES).to_parquet(PHOTOS_FILE, **PARQUET_OPTS)
+    if legacy is not None and "Photo_Path" in legacy:
+        save_data(legacy.reindex(columns=COLUMNS).astype(DTYPES))
+
+df = load_data()
 
 def generate_txn_id():
-    return f"TXN-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    # ns clock + random suffix: two submissions in the same second no longer share an ID
+    # (which overwrote each other's photos and ledger fragment)
+    return f"TXN-{time.time_ns():x}-{secrets.token_hex(2)}"
+
+def make_thumbnail(src):
+    # small JPEG copy for the admin viewer; originals stay untouched for export
+    from PIL import Image  # only needed when photos are uploaded
+
+    thumb = THUMBS_DIR / f"{src.name}.thumb.jpg"
+    with Image.open(src) as im:
+        # JPEG only: let libjpeg decode at reduced scale instead of full size
+        im.draft("RGB", THUMB_SIZE)
+        im.thumbnail(THUMB_SIZE, Image.Resampling.LANCZOS)
+        im.convert("RGB").save(thumb, "JPEG", quality=80, optimize=True, progressive=True)
+    return thumb
+
+def save_photo(f, dest):
+    # stream straight from the upload in 1 MiB chunks, no getbuffer() view
+    with open(dest, "wb", buffering=COPY_BUFFER) as out:
+        shutil.copyfileobj(f, out, length=COPY_BUFFER)
+    try:
+        thumb = str(make_thumbnail(dest))
+    except Exception:
+        # viewer falls back to the original
+        thumb = ""
+    return str(dest), thumb
 
 # ----------------------- UI -----------------------
 st.title("📦 Smart Meter Stock Management System")
@@ -85,30 +354,36 @@ with tabs[0]:
         else:
             txn_id = generate_txn_id()
             saved_photo_paths = []
+            saved_thumb_paths = []
 
-            for f in uploaded_photos:
-                # make a safe file name
-                safe_name = f"{txn_id}_{f.name}"
-                dest = PHOTOS_DIR / safe_name
-                with open(dest, "wb") as out:
-                    out.write(f.getbuffer())
-                saved_photo_paths.append(str(dest))
+            if uploaded_photos:
+                # make a safe, unique file name per upload — phones often name every photo
+                # image.jpg, and parallel writes to one path would corrupt it
+                dests = [PHOTOS_DIR / f"{txn_id}_{i}_{f.name}" for i, f in enumerate(uploaded_photos)]
+                # file writes and Pillow decode/resize release the GIL, so save photos in parallel
+                with ThreadPoolExecutor(max_workers=min(PHOTO_WORKERS, len(uploaded_photos))) as pool:
+                    for photo_path, thumb_path in pool.map(save_photo, uploaded_photos, dests):
+                        saved_photo_paths.append(photo_path)
+                        saved_thumb_paths.append(thumb_path)
 
             entry = {
-                "Date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "Date": datetime.now().replace(microsecond=0),
                 "Transaction_ID": txn_id,
                 "Action": "Stock Out",
                 "Meter_Type": ", ".join(meter_type),
                 "Meter_Quantity": int(meter_qty),
                 "CIU_Quantity": int(ciu_qty),
                 "Stock_Issued_To": stock_issued_to,
-                "Photo_Path": "|".join(saved_photo_paths),
                 "Status": "Pending Approval",
                 "Notes": notes or ""
             }
 
-            df = pd.concat([df, pd.DataFrame([entry])], ignore_index=True)
-            save_data(df)
+            if saved_photo_paths:
+                append_photos(txn_id, saved_photo_paths, saved_thumb_paths)
+            append_row(entry)
+            # only the fragments (at most MAX_FRAGMENTS small files) are read again here;
+            # the parsed main file is reused from _read_parquet_cached
+            df = load_data()
             st.success(f"Stock Out recorded. Transaction ID: {txn_id}")
             if saved_photo_paths:
                 st.info(f"{len(saved_photo_paths)} photo(s) saved to `photos/`.")
@@ -119,14 +394,24 @@ with tabs[1]:
     if df.empty:
         st.info("No transactions recorded yet.")
     else:
-        status_filter = st.selectbox("Filter by Status", ["All", "Pending Approval", "Approved", "Rejected"])
+        status_filter = st.selectbox("Filter by Status", ["All"] + STATUSES)
+        version = ledger_version()
+        ledger_sorted = sorted_ledger(version)
         if status_filter == "All":
-            display_df = df.copy()
+            rows = np.arange(len(ledger_sorted))
         else:
-            display_df = df[df["Status"] == status_filter].copy()
+            rows = status_positions(version)[status_filter]
 
-        display_df = display_df.sort_values(by="Date", ascending=False)
-        st.dataframe(display_df.reset_index(drop=True), use_container_width=True)
+        # only send one page to the browser; the full table can be tens of MB
+        page_count = max(1, -(-len(rows) // PAGE_SIZE))
+        page = st.number_input(f"Page (of {page_count})", min_value=1, step=1, value=1, key=f"page_{status_filter}")
+        page = min(int(page), page_count)
+        start = (page - 1) * PAGE_SIZE
+        # read-only view of just this page, no filtered copy of the ledger
+        page_df = ledger_sorted.iloc[rows[start:start + PAGE_SIZE]]
+        st.dataframe(page_df.reset_index(drop=True), use_container_width=True)
+        if len(rows):
+            st.caption(f"Showing {start + 1}–{start + len(page_df)} of {len(rows)} transactions")
 
         st.markdown("---")
         st.subheader("Approve / Reject Transactions")
@@ -135,8 +420,8 @@ with tabs[1]:
         with col_a:
             approve_id = st.text_input("Transaction ID to Approve", key="approve")
             if st.button("Approve Transaction"):
-                if approve_id and approve_id in df["Transaction_ID"].values:
-                    df.loc[df["Transaction_ID"] == approve_id, "Status"] = "Approved"
+                if approve_id and approve_id in df.index:
+                    df.loc[approve_id, "Status"] = "Approved"
                     save_data(df)
                     st.success(f"Transaction {approve_id} Approved.")
                 else:
@@ -145,8 +430,8 @@ with tabs[1]:
         with col_b:
             reject_id = st.text_input("Transaction ID to Reject", key="reject")
             if st.button("Reject Transaction"):
-                if reject_id and reject_id in df["Transaction_ID"].values:
-                    df.loc[df["Transaction_ID"] == reject_id, "Status"] = "Rejected"
+                if reject_id and reject_id in df.index:
+                    df.loc[reject_id, "Status"] = "Rejected"
                     save_data(df)
                     st.error(f"Transaction {reject_id} Rejected.")
                 else:
@@ -154,20 +439,28 @@ with tabs[1]:
 
         st.markdown("---")
         st.subheader("View Photos for a Transaction")
-        txn_options = [""] + df["Transaction_ID"].tolist()
-        view_txn = st.selectbox("Select Transaction ID to view photos", options=txn_options, key="view_photos")
+        txn_options = txn_ids(ledger_version())
+        view_txn = st.selectbox(
+            f"Select Transaction ID to view photos (newest {TXN_OPTION_LIMIT})", options=txn_options, key="view_photos"
+        )
+        # older transactions fall outside the list, so they can be looked up by ID
+        typed_txn = st.text_input("...or type any Transaction ID", key="view_photos_typed").strip()
+        if typed_txn:
+            view_txn = typed_txn if typed_txn in df.index else ""
+            if not view_txn:
+                st.error("Transaction ID not found.")
         if view_txn:
-            row = df[df["Transaction_ID"] == view_txn].iloc[0]
-            photo_field = row.get("Photo_Path", "")
-            if pd.isna(photo_field) or not photo_field:
+            photos = load_photos()
+            if view_txn not in photos.index:
                 st.info("No photos uploaded for this transaction.")
             else:
-                paths = photo_field.split("|")
-                for p in paths:
+                txn_photos = photos.loc[[view_txn]]
+                for p, thumb in zip(txn_photos["Photo_Path"], txn_photos["Thumb_Path"]):
                     if os.path.exists(p):
+                        # show the thumbnail when there is one; originals are in photos.zip
+                        shown = thumb if pd.notna(thumb) and thumb and os.path.exists(thumb) else p
                         try:
-                            img = Image.open(p)
-                            st.image(img, caption=os.path.basename(p), use_column_width=True)
+                            st.image(shown, caption=os.path.basename(p), use_column_width=True)
                         except Exception as e:
                             st.warning(f"Could not open image {p}: {e}")
                     else:
@@ -181,32 +474,48 @@ with tabs[2]:
     else:
         st.subheader("Quick Summary")
         try:
-            summary = df.groupby(["Meter_Type", "Status"], as_index=False)[["Meter_Quantity", "CIU_Quantity"]].sum()
+            summary = compute_summary(ledger_version())
             st.dataframe(summary, use_container_width=True)
         except Exception:
             st.warning("Could not generate summary. Check ledger data format.")
 
         st.markdown("---")
         st.subheader("Download full ledger")
-        csv_bytes = df.to_csv(index=False).encode("utf-8")
+        csv_bytes = ledger_csv_bytes(ledger_version())
         st.download_button("📥 Download CSV", csv_bytes, "stock_ledger.csv", "text/csv")
 
         st.subheader("Download photos as ZIP (all photos)")
-        # Create zip in memory
+        # Photos are added one at a time into a spooled temp file, but download_button needs the
+        # bytes up front, so the full archive is read into memory once when Prepare is clicked
         def make_photos_zip():
-            buf = BytesIO()
-            with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
-                for p in PHOTOS_DIR.glob("*"):
-                    # add file with just file name (no folders)
-                    z.write(p, arcname=p.name)
-            buf.seek(0)
-            return buf
-
-        if any(PHOTOS_DIR.iterdir()):
-            zip_buf = make_photos_zip()
-            st.download_button("📦 Download photos.zip", zip_buf, file_name="photos.zip", mime="application/zip")
-        else:
-            st.info("No photos available yet.")
+            import zipfile
+            # single scandir pass; DirEntry.is_file() reuses the stat from readdir
+            spool = tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_SIZE)
+            any_photo = False
+            # jpg/png are already compressed, so store them instead of deflating
+            with zipfile.ZipFile(spool, "w", zipfile.ZIP_STORED) as z:
+                with os.scandir(PHOTOS_DIR) as entries:
+                    for entry in entries:
+                        # add file with just file name (no folders, so no thumbnails)
+                        if entry.is_file():
+                            any_photo = True
+                            z.write(entry.path, arcname=entry.name)
+            if not any_photo:
+                spool.close()
+                return None
+            spool.seek(0)
+            return spool
+
+        # every tab renders on every rerun, so only zip when asked; the download file outlives
+        # the next rerun, so the button disappearing after the click is fine
+        if st.button("Prepare photos.zip"):
+            zip_file = make_photos_zip()
+            if zip_file is not None:
+                # download_button only accepts bytes / BytesIO / BufferedReader, so read the spool once here
+                with zip_file:
+                    st.download_button("📦 Download photos.zip", zip_file.read(), file_name="photos.zip", mime="application/zip")
+            else:
+                st.info("No photos available yet.")
 
     st.markdown("---")
-    st.markdown("*Tip: `data/stock_ledger.csv` and the `photos/` folder are created next to the app. Back them up regularly.*")
+    st.markdown("*Tip: the `data/` folder (ledger and photo index) and the `photos/` folder are created next to the app. Back them up regularly.*")